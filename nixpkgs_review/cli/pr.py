@@ -19,21 +19,25 @@ if TYPE_CHECKING:
     from nixpkgs_review.nix import Attr
 
 
+PR_RANGE_RE = re.compile(r"(\d+)-(\d+)")
+PR_URL_RE = re.compile(r"https://github\.com/NixOS/nixpkgs/pull/(\d+)/?.*")
+
+
 def parse_pr_numbers(number_args: list[str]) -> list[int]:
     prs: list[int] = []
     for arg in number_args:
-        m = re.match(r"(\d+)-(\d+)", arg)
+        m = PR_RANGE_RE.match(arg)
         if m:
             prs.extend(range(int(m.group(1)), int(m.group(2))))
         else:
-            m = re.match(r"https://github.com/NixOS/nixpkgs/pull/(\d+)/?.*", arg)
+            m = PR_URL_RE.match(arg)
             if m:
                 prs.append(int(m.group(1)))
             else:
                 try:
                     prs.append(int(arg))
                 except ValueError:
-                    warn(f"expected number or URL, got {m}")
+                    warn(f"expected number or URL, got {arg}")
                     sys.exit(1)
     return prs
 
@@ -1,13 +1,23 @@
+import base64
+import email.utils
+import gzip
+import http.client
+import io
 import json
+import random
 import shutil
 import tempfile
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import zipfile
-from http.client import HTTPMessage
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC
+from email.message import Message
 from pathlib import Path
-from typing import IO, Any, override
+from typing import Any
 
 from .utils import System, warn
 
@@ -16,21 +26,45 @@ def pr_url(pr: int) -> str:
     return f"https://github.com/NixOS/nixpkgs/pull/{pr}"
 
 
-class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
-    @override
-    def redirect_request(
-        self,
-        req: urllib.request.Request,
-        fp: IO[bytes],
-        code: int,
-        msg: str,
-        headers: HTTPMessage,
-        newurl: str,
-    ) -> urllib.request.Request | None:
+# How often a rate limited API request is retried before giving up
+MAX_RATE_LIMIT_RETRIES = 5
+# Longer waits are not worth it, we rather fail than block for up to an hour
+MAX_RATE_LIMIT_WAIT = 300.0
+# How many redirects an API GET request follows
+MAX_REDIRECTS = 5
+REDIRECT_CODES = frozenset({301, 302, 303, 307, 308})
+# Requests that may be sent again after a connection dropped mid-response
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+# Idle connections older than this are not reused, GitHub closes them eventually
+# and a review can sit in the build for hours between two API calls.
+MAX_IDLE_TIME = 5.0
+
+
+def _rate_limit_resource(url: str) -> str:
+    "The quota an API request counts against, as GitHub reports in X-RateLimit-Resource"
+    path = urllib.parse.urlsplit(url).path
+    if path == "/graphql":
+        return "graphql"
+    if path == "/search/code":
+        return "code_search"
+    if path.startswith("/search/"):
+        return "search"
+    return "core"
+
+
+def _parse_retry_after(value: str) -> float | None:
+    "Seconds to wait according to a Retry-After header, given either in seconds or as an HTTP date"
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
         return None
-
-
-no_redirect_opener = urllib.request.build_opener(NoRedirectHandler)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=UTC)
+    return max(date.timestamp() - time.time(), 0.0)
 
 
 class GithubClient:
@@ -39,9 +73,198 @@ class GithubClient:
         self.headers: dict[str, str] = {
             "Content-Type": "application/json",
             "Accept": "application/vnd.github+json",
+            # urllib used to set this for us, the GitHub API rejects requests without it
+            "User-Agent": "nixpkgs-review",
         }
         if self.api_token:
             self.headers["Authorization"] = f"token {self.api_token}"
+        # host -> (idle connection, time it was released). Reusing it saves
+        # a TCP+TLS handshake for every API call after the first one.
+        self._idle_connections: dict[
+            str, tuple[http.client.HTTPSConnection, float]
+        ] = {}
+        # resource -> (remaining, reset) as last reported by the API, see `_update_rate_limit`
+        self._rate_limits: dict[str, tuple[int, float]] = {}
+        # url -> (etag, body) of previous GET responses, for conditional requests
+        self._etag_cache: dict[str, tuple[str, bytes]] = {}
+
+    def _acquire_connection(
+        self, host: str, method: str
+    ) -> http.client.HTTPSConnection | None:
+        # A request on a connection the server already closed fails only after
+        # it was sent, non-idempotent ones always go over a fresh connection.
+        if method not in IDEMPOTENT_METHODS:
+            return None
+        idle = self._idle_connections.pop(host, None)
+        if idle is None:
+            return None
+        conn, released_at = idle
+        if time.monotonic() - released_at > MAX_IDLE_TIME:
+            conn.close()
+            return None
+        return conn
+
+    def _release_connection(self, host: str, conn: http.client.HTTPSConnection) -> None:
+        previous = self._idle_connections.get(host)
+        if previous is not None:
+            previous[0].close()
+        self._idle_connections[host] = (conn, time.monotonic())
+
+    def _new_connection(self, host: str) -> http.client.HTTPSConnection:
+        "Connect to `host`, tunneled through the https proxy from the environment if any"
+        proxy = urllib.request.getproxies().get("https")
+        if not proxy or urllib.request.proxy_bypass(host):
+            return http.client.HTTPSConnection(host)
+
+        # like urllib, accept proxies given without a scheme
+        if "://" not in proxy:
+            proxy = f"http://{proxy}"
+        proxy_parts = urllib.parse.urlsplit(proxy)
+        if proxy_parts.hostname is None:
+            msg = f"Invalid https proxy: {proxy}"
+            raise ValueError(msg)
+        conn = http.client.HTTPSConnection(proxy_parts.hostname, proxy_parts.port)
+        tunnel_headers = {}
+        if proxy_parts.username is not None:
+            credentials = urllib.parse.unquote(proxy_parts.username)
+            credentials += f":{urllib.parse.unquote(proxy_parts.password or '')}"
+            token = base64.b64encode(credentials.encode()).decode("ascii")
+            tunnel_headers["Proxy-Authorization"] = f"Basic {token}"
+        conn.set_tunnel(host, headers=tunnel_headers)
+        return conn
+
+    @contextmanager
+    def _open(
+        self,
+        url: str,
+        method: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Iterator[http.client.HTTPResponse]:
+        """
+        Send a request over a pooled connection and yield the unread response.
+        Redirects are not followed.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "https":
+            msg = f"URL must start with 'https:', got {url}"
+            raise ValueError(msg)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        if headers is None:
+            headers = self.headers
+
+        conn = self._acquire_connection(parts.netloc, method)
+        reused = conn is not None
+        while True:
+            if conn is None:
+                conn = self._new_connection(parts.netloc)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                conn = None
+                # The server might have closed an idle keep-alive connection,
+                # retry once on a fresh one. Only idempotent requests are sent
+                # over reused connections, so repeating them is safe.
+                if not reused:
+                    raise
+                reused = False
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        if resp.status >= 400:
+            error_body = resp.read()
+            conn.close()
+            raise urllib.error.HTTPError(
+                url, resp.status, resp.reason, resp.headers, io.BytesIO(error_body)
+            )
+
+        try:
+            yield resp
+        except BaseException:
+            conn.close()
+            raise
+
+        # Only connections whose response was fully consumed can be reused.
+        if resp.isclosed() and not resp.will_close:
+            self._release_connection(parts.netloc, conn)
+        else:
+            conn.close()
+
+    def _update_rate_limit(self, headers: Message) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            resource = headers.get("X-RateLimit-Resource", "core")
+            self._rate_limits[resource] = (int(remaining), float(reset))
+
+    def _rate_limit_exhausted_until(self, resource: str) -> float | None:
+        "Reset time of the quota for `resource` if it is used up"
+        remaining, reset = self._rate_limits.get(resource, (None, 0.0))
+        return reset if remaining == 0 else None
+
+    def _rate_limit_delay(
+        self, e: urllib.error.HTTPError, attempt: int
+    ) -> float | None:
+        "Seconds to wait before retrying a rejected request, None if it should not be retried"
+        if e.code not in (403, 429):
+            return None
+        self._update_rate_limit(e.headers)
+        retry_after = e.headers.get("Retry-After")
+        if retry_after is not None:
+            delay = _parse_retry_after(retry_after)
+            if delay is not None:
+                return delay
+        resource = e.headers.get("X-RateLimit-Resource", "core")
+        if (reset := self._rate_limit_exhausted_until(resource)) is not None:
+            return max(reset - time.time(), 0.0) + 1
+        if e.code == 429:
+            # secondary rate limit without a hint: exponential backoff with full jitter
+            return random.uniform(0, min(20.0, 0.2 * 2**attempt))  # noqa: S311
+        # a plain 403, e.g. missing permissions
+        return None
+
+    def _send_api_request(
+        self,
+        url: str,
+        method: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        "Send an API request, waiting out rate limits, and return the decoded body"
+        attempt = 0
+        while True:
+            reset = self._rate_limit_exhausted_until(_rate_limit_resource(url))
+            if reset is not None:
+                wait = reset - time.time()
+                if 0 < wait <= MAX_RATE_LIMIT_WAIT:
+                    warn(f"GitHub API rate limit exhausted, waiting {wait:.0f}s")
+                    time.sleep(wait)
+            try:
+                with self._open(url, method, body, headers) as resp:
+                    self._update_rate_limit(resp.headers)
+                    payload = resp.read()
+                    if resp.getheader("Content-Encoding") == "gzip":
+                        payload = gzip.decompress(payload)
+            except urllib.error.HTTPError as e:
+                delay = self._rate_limit_delay(e, attempt)
+                if (
+                    delay is None
+                    or delay > MAX_RATE_LIMIT_WAIT
+                    or attempt >= MAX_RATE_LIMIT_RETRIES
+                ):
+                    raise
+                warn(f"GitHub API rate limit hit, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                attempt += 1
+            else:
+                return resp, payload
 
     def _request(
         self,
@@ -55,14 +278,41 @@ class GithubClient:
         if data:
             body = json.dumps(data).encode("ascii")
 
-        req = urllib.request.Request(  # noqa: S310
-            url,
-            headers=self.headers,
-            method=method,
-            data=body,
-        )
-        with urllib.request.urlopen(req) as resp:  # noqa: S310
-            return json.loads(resp.read())
+        headers = {**self.headers, "Accept-Encoding": "gzip"}
+        cached = self._etag_cache.get(url) if method == "GET" else None
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        resp, payload = self._send_api_request(url, method, body, headers)
+        redirects = 0
+        current_url = url
+        while 300 <= resp.status < 400 and resp.status != 304:
+            location = urllib.parse.urljoin(current_url, resp.getheader("Location", ""))
+            # Only GETs are safe to repeat, and the token must not leave the API host.
+            if (
+                resp.status not in REDIRECT_CODES
+                or method != "GET"
+                or redirects >= MAX_REDIRECTS
+                or urllib.parse.urlsplit(location).netloc
+                != urllib.parse.urlsplit(url).netloc
+            ):
+                raise urllib.error.HTTPError(
+                    current_url,
+                    resp.status,
+                    resp.reason,
+                    resp.headers,
+                    io.BytesIO(payload),
+                )
+            redirects += 1
+            current_url = location
+            resp, payload = self._send_api_request(current_url, method, body, headers)
+
+        if resp.status == 304 and cached is not None:
+            # Unchanged, and conditional requests do not count against the rate limit.
+            payload = cached[1]
+        elif method == "GET" and (etag := resp.getheader("ETag")):
+            self._etag_cache[url] = (etag, payload)
+        return json.loads(payload)
 
     def get(self, path: str) -> Any:
         return self._request(path, "GET")
@@ -113,31 +363,25 @@ class GithubClient:
         """
         download_url: str = f"https://api.github.com/repos/NixOS/nixpkgs/actions/artifacts/{workflow_id}/zip"
 
-        req = urllib.request.Request(download_url, headers=self.headers)  # noqa: S310
-        try:
-            with no_redirect_opener.open(req) as resp:
-                pass
-        except urllib.error.HTTPError as e:
-            if e.code == 302:
-                new_url = e.headers["Location"]
-                # Handle the new URL as needed
-            else:
-                raise
-        else:
-            msg = f"Expected 302, got {resp.status}"
-            raise RuntimeError(msg)
+        with self._open(download_url, "GET") as resp:
+            resp.read()
+            if resp.status != 302:
+                msg = f"Expected 302, got {resp.status}"
+                raise RuntimeError(msg)
+            new_url = resp.getheader("Location", "")
 
-        if not new_url.startswith(("http:", "https:")):
-            msg = "URL must start with 'http:' or 'https:'"
+        if not new_url.startswith("https:"):
+            msg = "URL must start with 'https:'"
             raise ValueError(msg)
 
-        req = urllib.request.Request(new_url)  # noqa: S310
+        # The artifact is served from a storage host, which must not see our token.
+        headers = {"User-Agent": self.headers["User-Agent"]}
         with (
-            urllib.request.urlopen(req) as new_resp,  # noqa: S310
+            self._open(new_url, "GET", headers=headers) as new_resp,
             tempfile.TemporaryDirectory() as _temp_dir,
         ):
             temp_dir = Path(_temp_dir)
-            # download zip file to disk
+            # stream zip file to disk
             artifact_zip = temp_dir / "artifact.zip"
             with artifact_zip.open("wb") as f:
                 shutil.copyfileobj(new_resp, f)
@@ -4,6 +4,7 @@ import os
 import shlex
 import shutil
 import subprocess
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 from sys import platform
@@ -14,8 +15,37 @@ from .allow import AllowedFeatures
 from .errors import NixpkgsReviewError
 from .utils import ROOT, System, info, sh, warn
 
+# Keep `nix path-info` command lines well below ARG_MAX.
+PATH_INFO_CHUNK_SIZE: Final[int] = 2048
+MAX_PATH_INFO_WORKERS: Final[int] = 4
 
-@dataclass
+
+def _valid_store_paths(paths: list[str]) -> set[str] | None:
+    res = subprocess.run(
+        [
+            "nix",
+            "--extra-experimental-features",
+            "nix-command",
+            "path-info",
+            "--json",
+            *paths,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    if res.returncode != 0:
+        return None
+
+    infos = json.loads(res.stdout)
+    if isinstance(infos, dict):
+        # Nix >= 2.19: {"/nix/store/...": {...}} with null for invalid paths
+        return {path for path, info in infos.items() if info is not None}
+    # older Nix: [{"path": "/nix/store/...", "valid": false}, ...]
+    return {info["path"] for info in infos if info.get("valid", True) is not False}
+
+
+@dataclass(slots=True)
 class Attr:
     name: str
     exists: bool
@@ -25,6 +55,10 @@ class Attr:
     drv_path: str | None
     aliases: list[str] = field(default_factory=list)
     _path_verified: bool | None = field(init=False, default=None)
+    is_test: bool = field(init=False, default=False)
+
+    def __post_init__(self) -> None:
+        self.is_test = self.name.startswith("nixosTests.")
 
     def was_build(self) -> bool:
         if self.path is None:
@@ -50,8 +84,37 @@ class Attr:
         self._path_verified = res.returncode == 0
         return self._path_verified
 
-    def is_test(self) -> bool:
-        return self.name.startswith("nixosTests")
+    @staticmethod
+    def bulk_verify(attrs: Iterable["Attr"]) -> None:
+        """
+        Populate the `was_build` cache of many attributes with a single
+        `nix path-info` invocation instead of one process per attribute.
+        Large sets are split into chunks that are queried concurrently.
+        """
+        pending: dict[str, list[Attr]] = {}
+        for attr in attrs:
+            if attr.path is not None and attr._path_verified is None:  # noqa: SLF001
+                pending.setdefault(str(attr.path), []).append(attr)
+        if not pending:
+            return
+
+        paths = list(pending)
+        chunks = [
+            paths[i : i + PATH_INFO_CHUNK_SIZE]
+            for i in range(0, len(paths), PATH_INFO_CHUNK_SIZE)
+        ]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(chunks), MAX_PATH_INFO_WORKERS)
+        ) as executor:
+            for chunk, valid in zip(
+                chunks, executor.map(_valid_store_paths, chunks), strict=True
+            ):
+                if valid is None:
+                    # Unexpected failure, leave it to `was_build` to check paths one by one.
+                    continue
+                for path in chunk:
+                    for attr in pending[path]:
+                        attr._path_verified = path in valid  # noqa: SLF001
 
 
 REVIEW_SHELL: Final[str] = str(ROOT.joinpath("nix/review-shell.nix"))
@@ -187,9 +250,9 @@ def _nix_shell_sandbox(
     ]
 
 
-def _nix_eval_filter(json: dict[str, Any]) -> list[Attr]:
-    # workaround https://github.com/NixOS/ofborg/issues/269
-    blacklist = {
+# workaround https://github.com/NixOS/ofborg/issues/269
+BLACKLIST: Final[frozenset[str]] = frozenset(
+    {
         "appimage-run-tests",
         "darwin.builder",
         "nixos-install-tools",
@@ -200,33 +263,46 @@ def _nix_eval_filter(json: dict[str, Any]) -> list[Attr]:
         "tests.trivial",
         "tests.writers",
     }
-    attr_by_path: dict[Path, Attr] = {}
-    broken = []
-    for name, props in json.items():
-        path = props.get("path", None)
-        if path is not None:
-            path = Path(path)
+)
+
 
-        attr = Attr(
+def _nix_eval_filter(json: dict[str, Any]) -> list[Attr]:
+    def make_attr(name: str, path: Path | None, aliases: list[str]) -> Attr:
+        props = json[name]
+        return Attr(
             name=name,
             exists=props["exists"],
             broken=props["broken"],
-            blacklisted=name in blacklist,
+            blacklisted=name in BLACKLIST,
             path=path,
             drv_path=props["drvPath"],
+            aliases=aliases,
         )
-        if attr.path is not None:
-            other = attr_by_path.get(attr.path, None)
-            if other is None:
-                attr_by_path[attr.path] = attr
-            elif len(other.name) > len(attr.name):
-                attr_by_path[attr.path] = attr
-                attr.aliases.append(other.name)
-            else:
-                other.aliases.append(attr.name)
+
+    # Aliases evaluate to the same output path. Group names by path first so
+    # that only a single `Attr` is created per path.
+    # Keyed by the raw string, `Path` objects are only built for the winners.
+    names_by_path: dict[str, list[str]] = {}
+    broken = []
+    for name, props in json.items():
+        path = props.get("path", None)
+        if path is None:
+            broken.append(make_attr(name, None, []))
         else:
-            broken.append(attr)
-    return list(attr_by_path.values()) + broken
+            names_by_path.setdefault(path, []).append(name)
+
+    attrs = []
+    for path, names in names_by_path.items():
+        # the shortest name wins, on ties the first one evaluated
+        canonical = min(names, key=len)
+        aliases = [name for name in names if name != canonical]
+        attrs.append(make_attr(canonical, Path(path), aliases))
+    return attrs + broken
+
+
+# Attribute lists up to this size are passed through the environment instead
+# of a temporary file. A single environment string may not exceed 128KiB on Linux.
+MAX_INLINE_ATTRS_JSON: Final[int] = 64 * 1024
 
 
 def nix_eval(
@@ -235,12 +311,19 @@ def nix_eval(
     allow: AllowedFeatures,
     nix_path: str,
 ) -> list[Attr]:
-    attr_json = NamedTemporaryFile(mode="w+", delete=False)  # noqa: SIM115
+    attrs_json = json.dumps(list(attrs))
+    eval_script = str(ROOT.joinpath("nix/evalAttrs.nix"))
+    attr_json: Path | None = None
+    env: dict[str, str] | None = None
+    if len(attrs_json) <= MAX_INLINE_ATTRS_JSON:
+        env = os.environ | {"NIXPKGS_REVIEW_ATTRS": attrs_json}
+        expr = f"(import {eval_script} {{ }})"
+    else:
+        attr_json = _write_attrs_json(attrs_json)
+        expr = f"(import {eval_script} {{ attr-json = {attr_json}; }})"
+
     delete = True
     try:
-        json.dump(list(attrs), attr_json)
-        eval_script = str(ROOT.joinpath("nix/evalAttrs.nix"))
-        attr_json.flush()
         cmd = [
             "nix",
             "--extra-experimental-features",
@@ -256,22 +339,27 @@ def nix_eval(
             if allow.ifd
             else "--no-allow-import-from-derivation",
             "--expr",
-            f"(import {eval_script} {{ attr-json = {attr_json.name}; }})",
+            expr,
         ]
 
-        nix_eval = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=False)
+        nix_eval = subprocess.run(cmd, stdout=subprocess.PIPE, check=False, env=env)
         if nix_eval.returncode != 0:
             delete = False
-            msg = (
-                f"{' '.join(cmd)} failed to run, {attr_json.name} was stored inspection"
-            )
+            if attr_json is None:
+                attr_json = _write_attrs_json(attrs_json)
+            msg = f"{' '.join(cmd)} failed to run, {attr_json} was stored inspection"
             raise NixpkgsReviewError(msg)
 
         return _nix_eval_filter(json.loads(nix_eval.stdout))
     finally:
-        attr_json.close()
-        if delete:
-            Path(attr_json.name).unlink()
+        if delete and attr_json is not None:
+            attr_json.unlink()
+
+
+def _write_attrs_json(attrs_json: str) -> Path:
+    with NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+        f.write(attrs_json)
+    return Path(f.name)
 
 
 def multi_system_eval(
@@ -314,12 +402,27 @@ def nix_build(
         info("Nothing to be built.")
         return {}
 
-    attrs_per_system: dict[System, list[Attr]] = multi_system_eval(
-        attr_names_per_system,
-        allow,
-        nix_path,
-        n_threads=n_threads,
-    )
+    # Blacklisted attributes are never built, don't spend time evaluating them.
+    attrs_per_system: dict[System, list[Attr]] = {}
+    to_eval: dict[System, set[str]] = {}
+    for system, names in attr_names_per_system.items():
+        attrs_per_system[system] = [
+            Attr(
+                name=name,
+                exists=True,
+                broken=False,
+                blacklisted=True,
+                path=None,
+                drv_path=None,
+            )
+            for name in sorted(names & BLACKLIST)
+        ]
+        if names - BLACKLIST:
+            to_eval[system] = names - BLACKLIST
+    if to_eval:
+        evaluated = multi_system_eval(to_eval, allow, nix_path, n_threads=n_threads)
+        for system, attrs in evaluated.items():
+            attrs_per_system[system] = attrs + attrs_per_system[system]
 
     filtered_per_system: dict[System, list[str]] = {}
     for system, attrs in attrs_per_system.items():
@@ -363,6 +466,14 @@ def nix_build(
     ) + shlex.split(args)
 
     sh(command)
+
+    # Find out which builds succeeded in one go, the report needs all of them.
+    Attr.bulk_verify(
+        attr
+        for attrs in attrs_per_system.values()
+        for attr in attrs
+        if not (attr.broken or attr.blacklisted)
+    )
     return attrs_per_system
 
 
@@ -373,15 +484,13 @@ def build_shell_file_args(
     nixpkgs_config: Path,
 ) -> list[str]:
     attrs_file = cache_dir.joinpath("attrs.nix")
-    with attrs_file.open("w+") as f:
-        f.write("{\n")
-        for system, attrs in attrs_per_system.items():
-            f.write(f"  {system} = [\n")
-            for attr in attrs:
-                f.write(f'    "{attr}"\n')
-            f.write("  ];\n")
-        f.write("}")
-        print(f.read())
+    lines = ["{\n"]
+    for system, attrs in attrs_per_system.items():
+        lines.append(f"  {system} = [\n")
+        lines.extend(f'    "{attr}"\n' for attr in attrs)
+        lines.append("  ];\n")
+    lines.append("}")
+    attrs_file.write_text("".join(lines))
 
     return [
         "--argstr",
@@ -1,4 +1,7 @@
-{ attr-json }:
+{
+  # JSON file with the attributes to evaluate, read from $NIXPKGS_REVIEW_ATTRS if unset
+  attr-json ? null,
+}:
 
 with builtins;
 let
@@ -10,7 +13,9 @@ let
 
   inherit (pkgs) lib;
 
-  attrs = fromJSON (readFile attr-json);
+  attrs = fromJSON (
+    if attr-json == null then getEnv "NIXPKGS_REVIEW_ATTRS" else readFile attr-json
+  );
   getProperties =
     name:
     let
@@ -1,5 +1,8 @@
+import bz2
+import concurrent.futures
 import json
 import os
+import shutil
 import subprocess
 from collections.abc import Callable
 from pathlib import Path
@@ -15,11 +18,12 @@ def print_number(
     what: str = "package",
     log: Callable[[str], None] = warn,
 ) -> None:
-    if len(packages) == 0:
+    n = len(packages)
+    if n == 0:
         return
-    plural = "s" if len(packages) > 1 else ""
-    names = (a.name for a in packages)
-    log(f"{len(packages)} {what}{plural} {msg}:")
+    plural = "s" if n > 1 else ""
+    names = [a.name for a in packages]
+    log(f"{n} {what}{plural} {msg}:")
     log(" ".join(names))
     log("")
 
@@ -27,20 +31,21 @@ def print_number(
 def html_pkgs_section(
     emoji: str, packages: list[Attr], msg: str, what: str = "package"
 ) -> str:
-    if len(packages) == 0:
+    n = len(packages)
+    if n == 0:
         return ""
-    plural = "s" if len(packages) > 1 else ""
-    res = "<details>\n"
-    res += (
-        f"  <summary>{emoji} {len(packages)} {what}{plural} {msg}:</summary>\n  <ul>\n"
-    )
+    plural = "s" if n > 1 else ""
+    parts = [
+        "<details>\n",
+        f"  <summary>{emoji} {n} {what}{plural} {msg}:</summary>\n  <ul>\n",
+    ]
     for pkg in packages:
-        res += f"    <li>{pkg.name}"
-        if len(pkg.aliases) > 0:
-            res += f" ({' ,'.join(pkg.aliases)})"
-        res += "</li>\n"
-    res += "  </ul>\n</details>\n"
-    return res
+        if pkg.aliases:
+            parts.append(f"    <li>{pkg.name} ({', '.join(pkg.aliases)})</li>\n")
+        else:
+            parts.append(f"    <li>{pkg.name}</li>\n")
+    parts.append("  </ul>\n</details>\n")
+    return "".join(parts)
 
 
 class LazyDirectory:
@@ -55,10 +60,61 @@ class LazyDirectory:
         return self.path
 
 
+# Upper bound of concurrent `nix log` processes in `write_error_logs`
+MAX_LOG_WORKERS = 8
+
+
+def _local_log_file(drv_path: str) -> Path | None:
+    """
+    Locate the build log nix keeps for a derivation built on this machine,
+    so it can be read without spawning `nix log`.
+    """
+    base = Path(drv_path).name
+    log_dir = Path(os.environ.get("NIX_LOG_DIR", "/nix/var/log/nix"), "drvs", base[:2])
+    for name in [f"{base[2:]}.bz2", base[2:]]:
+        candidate = log_dir.joinpath(name)
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _write_log(attr: Attr, log_file: Path) -> None:
+    local_log = _local_log_file(attr.drv_path) if attr.drv_path else None
+    if local_log is not None:
+        open_log = bz2.open if local_log.suffix == ".bz2" else open
+        try:
+            with open_log(local_log, "rb") as src, log_file.open("wb") as dst:
+                shutil.copyfileobj(src, dst)
+        except (OSError, EOFError) as e:
+            # e.g. a truncated .bz2 left behind by an interrupted build
+            warn(f"Failed to read {local_log}, falling back to `nix log`: {e}")
+        else:
+            return
+
+    for path in [f"{attr.drv_path}^*", attr.path]:
+        if not path:
+            continue
+        with log_file.open("w+") as f:
+            nix_log = subprocess.run(
+                [
+                    "nix",
+                    "--extra-experimental-features",
+                    "nix-command",
+                    "log",
+                    path,
+                ],
+                stdout=f,
+                check=False,
+            )
+            if nix_log.returncode == 0:
+                break
+
+
 def write_error_logs(attrs_per_system: dict[str, list[Attr]], directory: Path) -> None:
     logs = LazyDirectory(directory.joinpath("logs"))
     results = LazyDirectory(directory.joinpath("results"))
     failed_results = LazyDirectory(directory.joinpath("failed_results"))
+    log_files: list[tuple[Attr, Path]] = []
     for system, attrs in attrs_per_system.items():
         for attr in attrs:
             # Broken attrs have no drv_path.
@@ -72,27 +128,26 @@ def write_error_logs(attrs_per_system: dict[str, list[Attr]], directory: Path) -
                     symlink_source = results.ensure().joinpath(attr_name)
                 else:
                     symlink_source = failed_results.ensure().joinpath(attr_name)
-                if os.path.lexists(symlink_source):
+                try:
+                    symlink_source.symlink_to(attr.path)
+                except FileExistsError:
+                    # left over from a previous run
                     symlink_source.unlink()
-                symlink_source.symlink_to(attr.path)
-
-            for path in [f"{attr.drv_path}^*", attr.path]:
-                if not path:
-                    continue
-                with logs.ensure().joinpath(attr_name + ".log").open("w+") as f:
-                    nix_log = subprocess.run(
-                        [
-                            "nix",
-                            "--extra-experimental-features",
-                            "nix-command",
-                            "log",
-                            path,
-                        ],
-                        stdout=f,
-                        check=False,
-                    )
-                    if nix_log.returncode == 0:
-                        break
+                    symlink_source.symlink_to(attr.path)
+
+            log_files.append((attr, logs.ensure().joinpath(attr_name + ".log")))
+
+    if not log_files:
+        return
+
+    # Every `nix log` is its own process, run a few of them at once.
+    max_workers = min(MAX_LOG_WORKERS, len(log_files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_write_log, attr, log_file) for attr, log_file in log_files
+        ]
+        for future in futures:
+            future.result()
 
 
 def _serialize_attrs(attrs: list[Attr]) -> list[str]:
@@ -115,7 +170,7 @@ class SystemReport:
                 self.blacklisted.append(attr)
             elif not attr.exists:
                 self.non_existent.append(attr)
-            elif attr.name.startswith("nixosTests."):
+            elif attr.is_test:
                 self.tests.append(attr)
             elif not attr.was_build():
                 self.failed.append(attr)
@@ -162,6 +217,9 @@ class Report:
         else:
             self.extra_nixpkgs_config = None
 
+        # Check all built paths at once rather than once per attribute
+        Attr.bulk_verify(a for attrs in attrs_per_system.values() for a in attrs)
+
         reports: dict[System, SystemReport] = {}
         for system, attrs in attrs_per_system.items():
             reports[system] = SystemReport(attrs)
@@ -174,8 +232,8 @@ class Report:
         }
 
     def write(self, directory: Path, pr: int | None) -> None:
-        directory.joinpath("report.md").write_text(self.markdown(pr))
-        directory.joinpath("report.json").write_text(self.json(pr))
+        directory.joinpath("report.md").write_bytes(self.markdown(pr).encode("utf-8"))
+        directory.joinpath("report.json").write_bytes(self.json(pr).encode("utf-8"))
 
         write_error_logs(self.attrs, directory)
 
@@ -200,10 +258,12 @@ class Report:
         )
 
     def markdown(self, pr: int | None) -> str:
-        msg = ""
+        parts: list[str] = []
         if self.show_header:
-            msg += "## `nixpkgs-review` result\n\n"
-            msg += "Generated using [`nixpkgs-review`](https://github.com/Mic92/nixpkgs-review).\n\n"
+            parts.append("## `nixpkgs-review` result\n\n")
+            parts.append(
+                "Generated using [`nixpkgs-review`](https://github.com/Mic92/nixpkgs-review).\n\n"
+            )
 
             cmd = "nixpkgs-review"
             if pr is not None:
@@ -212,29 +272,34 @@ class Report:
                 cmd += f" --extra-nixpkgs-config '{self.extra_nixpkgs_config}'"
             if self.checkout != "merge":
                 cmd += f" --checkout {self.checkout}"
-            msg += f"Command: `{cmd}`\n"
+            parts.append(f"Command: `{cmd}`\n")
 
         for system, report in self.system_reports.items():
-            msg += "\n---\n"
-            msg += f"### `{system}`\n"
-            msg += html_pkgs_section(
-                ":fast_forward:", report.broken, "marked as broken and skipped"
+            parts.append(f"\n---\n### `{system}`\n")
+            parts.append(
+                html_pkgs_section(
+                    ":fast_forward:", report.broken, "marked as broken and skipped"
+                )
             )
-            msg += html_pkgs_section(
-                ":fast_forward:",
-                report.non_existent,
-                "present in ofBorgs evaluation, but not found in the checkout",
+            parts.append(
+                html_pkgs_section(
+                    ":fast_forward:",
+                    report.non_existent,
+                    "present in ofBorgs evaluation, but not found in the checkout",
+                )
             )
-            msg += html_pkgs_section(
-                ":fast_forward:", report.blacklisted, "blacklisted"
+            parts.append(
+                html_pkgs_section(":fast_forward:", report.blacklisted, "blacklisted")
             )
-            msg += html_pkgs_section(":x:", report.failed, "failed to build")
-            msg += html_pkgs_section(
-                ":white_check_mark:", report.tests, "built", what="test"
+            parts.append(html_pkgs_section(":x:", report.failed, "failed to build"))
+            parts.append(
+                html_pkgs_section(
+                    ":white_check_mark:", report.tests, "built", what="test"
+                )
             )
-            msg += html_pkgs_section(":white_check_mark:", report.built, "built")
+            parts.append(html_pkgs_section(":white_check_mark:", report.built, "built"))
 
-        return msg
+        return "".join(parts)
 
     def print_console(self, pr: int | None) -> None:
         if pr is not None:
@@ -555,7 +555,7 @@ def join_packages(
     )
 
     # ofborg does not include tests and manual evaluation is too expensive
-    tests = {path: attr for path, attr in specified_attrs.items() if attr.is_test()}
+    tests = {path: attr for path, attr in specified_attrs.items() if attr.is_test}
 
     nonexistent = specified_attrs.keys() - changed_attrs.keys() - tests.keys()
 
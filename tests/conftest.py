@@ -1,3 +1,4 @@
+import io
 import json
 import os
 import shutil
@@ -7,6 +8,7 @@ import tempfile
 from collections.abc import Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
+from http.client import HTTPMessage
 from pathlib import Path
 from typing import Any, cast
 
@@ -70,6 +72,27 @@ def setup_nixpkgs(target: Path) -> Path:
     return target
 
 
+class FakeHTTPResponse(io.BytesIO):
+    "Stand-in for `http.client.HTTPResponse` as returned by a mocked `HTTPSConnection`"
+
+    def __init__(
+        self, data: bytes, status: int = 200, headers: dict[str, str] | None = None
+    ) -> None:
+        super().__init__(data)
+        self.status = status
+        self.reason = "OK" if status < 300 else "Error"
+        self.will_close = False
+        self.headers = HTTPMessage()
+        for key, value in (headers or {}).items():
+            self.headers.add_header(key, value)
+
+    def getheader(self, name: str, default: str | None = None) -> str | None:
+        return self.headers.get(name, default)
+
+    def isclosed(self) -> bool:
+        return self.tell() >= len(self.getvalue())
+
+
 class Chdir:
     def __init__(self, path: Path | str) -> None:
         self.old_dir = Path.cwd()
@@ -108,6 +131,14 @@ class Helpers:
     def read_asset(asset: str) -> str:
         return (TEST_ROOT / "assets" / asset).read_text()
 
+    @staticmethod
+    def http_response(
+        data: str | bytes, status: int = 200, headers: dict[str, str] | None = None
+    ) -> FakeHTTPResponse:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return FakeHTTPResponse(data, status, headers)
+
     @staticmethod
     def load_report(review_dir: str) -> dict[str, Any]:
         data = (Path(review_dir) / "report.json").read_text()
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from nixpkgs_review.nix import Attr
+
+
+def fake_nix(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, script: str) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    nix = bin_dir / "nix"
+    nix.write_text(f"#!/bin/sh\n{script}\n")
+    nix.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+
+
+def attr(path: str) -> Attr:
+    return Attr(
+        path,
+        exists=True,
+        broken=False,
+        blacklisted=False,
+        path=Path(f"/nix/store/{path}"),
+        drv_path=None,
+    )
+
+
+def test_path_info_dict(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Nix >= 2.19
+    fake_nix(
+        tmp_path,
+        monkeypatch,
+        """echo '{"/nix/store/built": {"narSize": 1}, "/nix/store/failed": null}'""",
+    )
+    built, failed = attr("built"), attr("failed")
+    Attr.bulk_verify([built, failed])
+    assert built._path_verified is True  # noqa: SLF001
+    assert failed._path_verified is False  # noqa: SLF001
+
+
+def test_path_info_list(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    fake_nix(
+        tmp_path,
+        monkeypatch,
+        """echo '[{"path": "/nix/store/built", "narSize": 1}, """
+        """{"path": "/nix/store/failed", "valid": false}]'""",
+    )
+    built, failed = attr("built"), attr("failed")
+    Attr.bulk_verify([built, failed])
+    assert built._path_verified is True  # noqa: SLF001
+    assert failed._path_verified is False  # noqa: SLF001
+
+
+def test_path_info_failure_falls_back_to_was_build(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # `path-info` fails, the per-attribute `store verify` succeeds
+    fake_nix(
+        tmp_path,
+        monkeypatch,
+        'case "$*" in *path-info*) exit 1;; esac',
+    )
+    built = attr("built")
+    Attr.bulk_verify([built])
+    assert built._path_verified is None  # noqa: SLF001
+    assert built.was_build()
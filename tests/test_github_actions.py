@@ -1,38 +1,38 @@
 import os
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, patch
 
 from nixpkgs_review.cli import main
 
 from .conftest import Helpers
 
 
-@patch("urllib.request.urlopen")
-def test_post_result(mock_urlopen: MagicMock, helpers: Helpers) -> None:
+@patch("http.client.HTTPSConnection")
+def test_post_result(mock_conn: MagicMock, helpers: Helpers) -> None:
     with helpers.nixpkgs() as nixpkgs:
         root = nixpkgs.path.parent
 
         os.environ["PR"] = "1"
         os.environ["GITHUB_TOKEN"] = "foo"  # noqa: S105
         os.environ["NIXPKGS_REVIEW_ROOT"] = str(root)
-        mock_urlopen.side_effect = [mock_open(read_data="{}")()]
+        mock_conn.return_value.getresponse.side_effect = [helpers.http_response("{}")]
 
         (root / "report.md").write_text("")
         main("nixpkgs-review", ["post-result"])
 
 
-@patch("urllib.request.urlopen")
-def test_merge(mock_urlopen: MagicMock, helpers: Helpers) -> None:
+@patch("http.client.HTTPSConnection")
+def test_merge(mock_conn: MagicMock, helpers: Helpers) -> None:
     with helpers.save_environ():
         os.environ["PR"] = "1"
         os.environ["GITHUB_TOKEN"] = "foo"  # noqa: S105
-        mock_urlopen.side_effect = [mock_open(read_data="{}")()]
+        mock_conn.return_value.getresponse.side_effect = [helpers.http_response("{}")]
         main("nixpkgs-review", ["merge"])
 
 
-@patch("urllib.request.urlopen")
-def test_approve(mock_urlopen: MagicMock, helpers: Helpers) -> None:
+@patch("http.client.HTTPSConnection")
+def test_approve(mock_conn: MagicMock, helpers: Helpers) -> None:
     with helpers.save_environ():
         os.environ["PR"] = "1"
         os.environ["GITHUB_TOKEN"] = "foo"  # noqa: S105
-        mock_urlopen.side_effect = [mock_open(read_data="{}")()]
+        mock_conn.return_value.getresponse.side_effect = [helpers.http_response("{}")]
         main("nixpkgs-review", ["approve"])
@@ -0,0 +1,26 @@
+from typing import Any
+
+from nixpkgs_review.nix import _nix_eval_filter
+
+
+def props(path: str | None) -> dict[str, Any]:
+    return {
+        "exists": True,
+        "broken": path is None,
+        "path": path,
+        "drvPath": None if path is None else f"{path}.drv",
+    }
+
+
+def test_aliases_are_grouped_by_path() -> None:
+    attrs = _nix_eval_filter(
+        {
+            "python3Packages.foo": props("/nix/store/foo"),
+            "foo": props("/nix/store/foo"),
+            "pythonPackages.foo": props("/nix/store/foo"),
+            "bar": props(None),
+        }
+    )
+    assert [a.name for a in attrs] == ["foo", "bar"]
+    assert attrs[0].aliases == ["python3Packages.foo", "pythonPackages.foo"]
+    assert attrs[1].broken
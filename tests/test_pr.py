@@ -2,9 +2,7 @@ import io
 import shutil
 import subprocess
 import zipfile
-from http.client import HTTPMessage
-from unittest.mock import MagicMock, Mock, mock_open, patch
-from urllib.error import HTTPError
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
@@ -126,8 +124,8 @@ def test_pr_local_eval_with_sandbox(helpers: Helpers) -> None:
         helpers.assert_built(pkg_name="pkg1", path=path)
 
 
-@patch("urllib.request.urlopen")
-def test_pr_ofborg_eval(mock_urlopen: MagicMock, helpers: Helpers) -> None:
+@patch("http.client.HTTPSConnection")
+def test_pr_ofborg_eval(mock_conn: MagicMock, helpers: Helpers) -> None:
     with helpers.nixpkgs() as nixpkgs:
         nixpkgs.path.joinpath("pkg1.txt").write_text("foo")
         subprocess.run(["git", "add", "."], check=True)
@@ -137,25 +135,21 @@ def test_pr_ofborg_eval(mock_urlopen: MagicMock, helpers: Helpers) -> None:
             ["git", "push", str(nixpkgs.remote), "pull/37200/merge"], check=True
         )
 
-        mock_urlopen.side_effect = [
-            mock_open(
-                read_data=helpers.read_asset(
-                    "test_pr_ofborg_eval/github-pull-37200.json"
-                )
-            )(),
-            mock_open(
-                read_data=helpers.read_asset(
-                    "test_pr_ofborg_eval/github-workflows-37200.json"
-                )
-            )(),
-            mock_open(
-                read_data=helpers.read_asset(
+        mock_conn.return_value.getresponse.side_effect = [
+            helpers.http_response(
+                helpers.read_asset("test_pr_ofborg_eval/github-pull-37200.json")
+            ),
+            helpers.http_response(
+                helpers.read_asset("test_pr_ofborg_eval/github-workflows-37200.json")
+            ),
+            helpers.http_response(
+                helpers.read_asset(
                     "test_pr_ofborg_eval/github-pull-37200-statuses.json"
                 )
-            )(),
-            helpers.read_asset("test_pr_ofborg_eval/gist-37200.txt")
-            .encode("utf-8")
-            .split(b"\n"),
+            ),
+            helpers.http_response(
+                helpers.read_asset("test_pr_ofborg_eval/gist-37200.txt")
+            ),
         ]
 
         path = main(
@@ -172,9 +166,9 @@ def test_pr_ofborg_eval(mock_urlopen: MagicMock, helpers: Helpers) -> None:
         helpers.assert_built(pkg_name="pkg1", path=path)
 
 
-@patch("urllib.request.urlopen")
+@patch("http.client.HTTPSConnection")
 def test_pr_github_action_eval(
-    mock_urlopen: MagicMock,
+    mock_conn: MagicMock,
     helpers: Helpers,
 ) -> None:
     with helpers.nixpkgs() as nixpkgs:
@@ -197,47 +191,35 @@ def test_pr_github_action_eval(
             )
         mock_zip.seek(0)
 
-        mock_urlopen.side_effect = [
-            mock_open(
-                read_data=helpers.read_asset(
-                    "test_pr_github_action_eval/github-pull-363128.json"
-                )
-            )(),
-            mock_open(
-                read_data=helpers.read_asset(
+        mock_conn.return_value.getresponse.side_effect = [
+            helpers.http_response(
+                helpers.read_asset("test_pr_github_action_eval/github-pull-363128.json")
+            ),
+            helpers.http_response(
+                helpers.read_asset(
                     "test_pr_github_action_eval/github-workflows-363128.json"
                 )
-            )(),
-            mock_open(
-                read_data=helpers.read_asset(
+            ),
+            helpers.http_response(
+                helpers.read_asset(
                     "test_pr_github_action_eval/github-artifacts-363128.json"
                 )
-            )(),
-            mock_open(read_data=mock_zip.getvalue())(),
+            ),
+            helpers.http_response(
+                b"", status=302, headers={"Location": "https://example.com"}
+            ),
+            helpers.http_response(mock_zip.getvalue()),
         ]
 
-        hdrs = HTTPMessage()
-        hdrs.add_header("Location", "http://example.com")
-        http_error = HTTPError(
-            url="http://example.com",
-            code=302,
-            msg="Found",
-            hdrs=hdrs,
-            fp=None,
+        path = main(
+            "nixpkgs-review",
+            [
+                "pr",
+                "--remote",
+                str(nixpkgs.remote),
+                "--run",
+                "exit 0",
+                "363128",
+            ],
         )
-
-        with patch(
-            "nixpkgs_review.github.no_redirect_opener.open", side_effect=http_error
-        ):
-            path = main(
-                "nixpkgs-review",
-                [
-                    "pr",
-                    "--remote",
-                    str(nixpkgs.remote),
-                    "--run",
-                    "exit 0",
-                    "363128",
-                ],
-            )
-            helpers.assert_built(pkg_name="pkg1", path=path)
+        helpers.assert_built(pkg_name="pkg1", path=path)
@@ -0,0 +1,69 @@
+import bz2
+from pathlib import Path
+
+import pytest
+
+from nixpkgs_review.nix import Attr
+from nixpkgs_review.report import _write_log, html_pkgs_section
+
+
+def test_local_log_is_read_without_nix(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("NIX_LOG_DIR", str(tmp_path))
+    monkeypatch.setenv("PATH", "")
+    drv_dir = tmp_path / "drvs" / "ab"
+    drv_dir.mkdir(parents=True)
+    (drv_dir / "cdef-foo.drv.bz2").write_bytes(bz2.compress(b"build log\n"))
+    attr = Attr(
+        "foo",
+        exists=True,
+        broken=False,
+        blacklisted=False,
+        path=None,
+        drv_path="/nix/store/abcdef-foo.drv",
+    )
+    log_file = tmp_path / "foo.log"
+    _write_log(attr, log_file)
+    assert log_file.read_text() == "build log\n"
+
+
+def test_truncated_local_log_falls_back_to_nix_log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("NIX_LOG_DIR", str(tmp_path))
+    drv_dir = tmp_path / "drvs" / "ab"
+    drv_dir.mkdir(parents=True)
+    compressed = bz2.compress(b"build log\n" * 100)
+    (drv_dir / "cdef-foo.drv.bz2").write_bytes(compressed[: len(compressed) // 2])
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    nix = bin_dir / "nix"
+    nix.write_text("#!/bin/sh\necho log from nix\n")
+    nix.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir))
+    attr = Attr(
+        "foo",
+        exists=True,
+        broken=False,
+        blacklisted=False,
+        path=None,
+        drv_path="/nix/store/abcdef-foo.drv",
+    )
+    log_file = tmp_path / "foo.log"
+    _write_log(attr, log_file)
+    assert log_file.read_text() == "log from nix\n"
+
+
+def test_html_pkgs_section_lists_aliases() -> None:
+    attr = Attr(
+        "foo",
+        exists=True,
+        broken=False,
+        blacklisted=False,
+        path=None,
+        drv_path=None,
+        aliases=["python3Packages.foo", "python312Packages.foo"],
+    )
+    section = html_pkgs_section(":x:", [attr], "failed to build")
+    assert "<li>foo (python3Packages.foo, python312Packages.foo)</li>" in section